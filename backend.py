@@ -1,14 +1,25 @@
 # backend.py - FastAPI Backend for Video Analysis & Summarizer Agent
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import Response, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 from typing import Optional, List
 import os
+import asyncio
+import subprocess
 import tempfile
-import requests
+import httpx
 import re
+import orjson
+import hashlib
+import xxhash
+import collections
+import time
+import threading
+import aiosqlite
+import diskcache
 from datetime import datetime
 import uuid
 
@@ -16,26 +27,24 @@ import uuid
 from langchain.chat_models import ChatOpenAI
 from langchain.schema import HumanMessage
 from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.globals import set_llm_cache
+from langchain.cache import SQLiteCache
 
 # Video processing imports
 import pytube
-from moviepy.editor import VideoFileClip
-import speech_recognition as sr
+import numpy as np
+from faster_whisper import WhisperModel
 
-# NLP and sentiment analysis
-import nltk
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
+# Sentiment analysis
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 # Environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
-# Download required NLTK data
-nltk.download('vader_lexicon', quiet=True)
-
 # Initialize FastAPI app
-app = FastAPI(title="Video Summarizer API")
+app = FastAPI(title="Video Summarizer API", default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -46,9 +55,78 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Cache locations
+DATA_DIR = "data"
+LLM_CACHE_PATH = os.path.join(DATA_DIR, "llm_cache.sqlite")
+SUMMARY_CACHE_DIR = os.path.join(DATA_DIR, "summaries")  # Shared by every worker process
+SUMMARY_CACHE_SIZE = 64 << 20  # Bytes; least recently used summaries are evicted first
+SUMMARY_DB_PATH = os.path.join(DATA_DIR, "summaries.sqlite")
+YOUTUBE_CACHE_DIR = os.path.join(DATA_DIR, "youtube")  # Transcripts and metadata
+YOUTUBE_CACHE_TTL = 24 * 60 * 60  # Seconds
+
+# YouTube metadata and transcript fetching
+YOUTUBE_OEMBED_URL = "https://www.youtube.com/oembed"
+TRANSCRIPT_LANGUAGE = "en"
+YOUTUBE_API_CONCURRENCY = 4  # Concurrent upstream calls, to stay clear of 429s
+
+# Uploads are copied to disk in chunks of this many bytes
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Audio decoding (16 kHz mono signed 16-bit PCM) and local speech-to-text
+AUDIO_SAMPLE_RATE = 16000
+WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'base')
+
+# LLM calls in flight at once per worker, to stay clear of OpenAI rate limits
+LLM_CONCURRENCY = 8
+
+# Transcripts over the token budget are summarized map-reduce style. The budget
+# leaves room in gpt-3.5-turbo's 4096-token context for the instructions and
+# a long summary
+TRANSCRIPT_TOKEN_BUDGET = 3000
+TRANSCRIPT_CHUNK_SIZE = 3000  # Characters per map chunk
+TRANSCRIPT_CHUNK_OVERLAP = 200
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = collections.OrderedDict()
+
+    def get(self, key):
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+# YouTube video ID in watch, short-link, shorts, embed and live URLs
+VIDEO_ID_PATTERN = re.compile(r'(?:v=|youtu\.be/|/shorts/|/embed/|/live/|/v/)([0-9A-Za-z_-]{11})')
+
+# Keyword extraction
+KEYWORD_PATTERN = re.compile(r'\b[a-zA-Z]{5,}\b')  # Words of five or more letters
+STOP_WORDS = frozenset({
+    'this', 'that', 'with', 'have', 'will', 'from', 'they', 'been',
+    'were', 'said', 'each', 'which', 'their', 'time', 'about', 'would',
+    'there', 'could', 'other', 'more', 'very', 'what', 'know', 'just'
+})
+
 # Initialize components
-summary_storage = []  # In-memory storage for demo
+sentiment_cache = LRUCache(maxsize=256)  # Sentiment scores keyed by transcript hash
+keyword_cache = LRUCache(maxsize=256)  # Keywords keyed by transcript hash
+youtube_api_limiter = threading.BoundedSemaphore(YOUTUBE_API_CONCURRENCY)
+whisper_model = None  # Loaded by get_whisper_model when audio first needs transcribing
+whisper_lock = threading.Lock()
 sentiment_analyzer = SentimentIntensityAnalyzer()
+transcript_splitter = RecursiveCharacterTextSplitter(
+    chunk_size=TRANSCRIPT_CHUNK_SIZE,
+    chunk_overlap=TRANSCRIPT_CHUNK_OVERLAP
+)
 
 # Pydantic models
 class SummaryRequest(BaseModel):
@@ -70,13 +148,46 @@ class SummaryResponse(BaseModel):
 # Helper functions
 def extract_video_id(url: str) -> str:
     """Extract video ID from YouTube URL"""
-    pattern = r'(?:v=|\/)([0-9A-Za-z_-]{11}).*'
-    match = re.search(pattern, url)
+    match = VIDEO_ID_PATTERN.search(url)
     if match:
         return match.group(1)
     raise ValueError("Invalid YouTube URL")
 
-def get_video_metadata(video_id: str) -> dict:
+async def get_video_metadata(video_id: str) -> dict:
+    """Get video metadata from YouTube's oEmbed endpoint, falling back to pytube"""
+    cache_key = f"metadata:{video_id}"
+    metadata = app.state.youtube_cache.get(cache_key)
+    if metadata is not None:
+        return metadata
+    
+    try:
+        response = await app.state.http.get(
+            YOUTUBE_OEMBED_URL,
+            params={"url": f"https://youtu.be/{video_id}", "format": "json"}
+        )
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=400, detail=f"Error fetching metadata: {str(e)}")
+    
+    if response.status_code in (401, 404):
+        # oEmbed refuses videos with embedding disabled; scrape the watch page instead
+        metadata = await asyncio.to_thread(get_pytube_metadata, video_id)
+    elif response.is_success:
+        data = response.json()
+        metadata = {
+            "title": data.get("title"),
+            "author": data.get("author_name"),
+            "length": None,
+            "views": None,
+            "thumbnail": data.get("thumbnail_url"),
+            "publish_date": None
+        }
+    else:
+        raise HTTPException(status_code=400, detail=f"Error fetching metadata: HTTP {response.status_code}")
+    
+    app.state.youtube_cache.set(cache_key, metadata, expire=YOUTUBE_CACHE_TTL)
+    return metadata
+
+def get_pytube_metadata(video_id: str) -> dict:
     """Get video metadata using pytube"""
     try:
         yt = pytube.YouTube(f"https://www.youtube.com/watch?v={video_id}")
@@ -92,33 +203,58 @@ def get_video_metadata(video_id: str) -> dict:
         raise HTTPException(status_code=400, detail=f"Error fetching metadata: {str(e)}")
 
 def extract_youtube_transcript(video_id: str) -> str:
-    """Extract transcript from YouTube video"""
+    """Extract transcript from YouTube video, served from the on-disk cache when possible"""
+    cache_key = f"transcript:{video_id}:{TRANSCRIPT_LANGUAGE}"
+    transcript = app.state.youtube_cache.get(cache_key)
+    if transcript is not None:
+        return transcript
+    
     try:
         from youtube_transcript_api import YouTubeTranscriptApi
-        transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
+        with youtube_api_limiter:
+            transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=[TRANSCRIPT_LANGUAGE])
         transcript = " ".join([item['text'] for item in transcript_list])
-        return transcript
     except Exception as e:
         # Fallback to audio extraction and speech recognition
-        return extract_audio_transcript(f"https://www.youtube.com/watch?v={video_id}")
+        transcript = extract_audio_transcript(f"https://www.youtube.com/watch?v={video_id}")
+    
+    app.state.youtube_cache.set(cache_key, transcript, expire=YOUTUBE_CACHE_TTL)
+    return transcript
+
+def decode_audio(video_path: str) -> bytes:
+    """Decode the audio track of a video to raw PCM by piping it out of ffmpeg"""
+    result = subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-loglevel", "error",
+            "-i", video_path,
+            "-vn", "-ac", "1", "-ar", str(AUDIO_SAMPLE_RATE),
+            "-f", "s16le", "-"
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode(errors="replace").strip() or "ffmpeg failed")
+    return result.stdout
+
+def get_whisper_model() -> WhisperModel:
+    """Load the Whisper model on first use; later calls share the same instance"""
+    global whisper_model
+    with whisper_lock:
+        if whisper_model is None:
+            whisper_model = WhisperModel(WHISPER_MODEL, device="auto", compute_type="int8")
+    return whisper_model
 
 def extract_audio_transcript(video_path: str) -> str:
-    """Extract transcript from video file using speech recognition"""
+    """Extract transcript from video file using local Whisper speech recognition"""
     try:
-        # Extract audio from video
-        video = VideoFileClip(video_path)
-        audio_path = tempfile.mktemp(suffix=".wav")
-        video.audio.write_audiofile(audio_path, verbose=False, logger=None)
+        # Extract audio from video straight into memory
+        pcm = decode_audio(video_path)
+        audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
         
-        # Convert audio to text
-        recognizer = sr.Recognizer()
-        with sr.AudioFile(audio_path) as source:
-            audio = recognizer.record(source)
-            transcript = recognizer.recognize_google(audio)
-        
-        # Cleanup
-        os.remove(audio_path)
-        video.close()
+        # Convert audio to text; segments are decoded lazily while iterating
+        segments, _ = get_whisper_model().transcribe(audio, beam_size=1)
+        transcript = " ".join(segment.text.strip() for segment in segments)
         
         return transcript
     except Exception as e:
@@ -146,20 +282,11 @@ def analyze_sentiment(text: str) -> dict:
 
 def extract_keywords(text: str) -> List[str]:
     """Extract keywords from text using regex and common word filtering"""
-    import collections
-    
     # Simple keyword extraction (can be enhanced with more sophisticated NLP)
-    words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
-    
-    # Filter out common stop words
-    stop_words = {'this', 'that', 'with', 'have', 'will', 'from', 'they', 'been', 
-                  'were', 'said', 'each', 'which', 'their', 'time', 'about', 'would', 
-                  'there', 'could', 'other', 'more', 'very', 'what', 'know', 'just'}
-    
-    filtered_words = [word for word in words if word not in stop_words and len(word) > 4]
+    words = KEYWORD_PATTERN.findall(text.lower())
     
-    # Get most common keywords
-    word_freq = collections.Counter(filtered_words)
+    # Get most common keywords, ignoring common stop words
+    word_freq = collections.Counter(word for word in words if word not in STOP_WORDS)
     keywords = [word for word, freq in word_freq.most_common(10)]
     
     return keywords
@@ -195,33 +322,300 @@ def get_summary_prompt(format_type: str, length: str, language: str) -> str:
     
     return prompt
 
-def generate_summary(transcript: str, format_type: str = "bullet_points", 
-                    length: str = "medium", language: str = "english") -> str:
+def get_chunk_summary_prompt() -> str:
+    """Prompt for the map step that condenses one section of a long transcript"""
+    return """
+    Please summarize the following section of a video transcript. 
+    It will be combined with summaries of the other sections, so keep every 
+    main topic, key insight, and important fact, and do not add an introduction.
+    
+    Transcript section: {transcript}
+    
+    Summary:
+    """
+
+def summary_cache_key(transcript: str, format_type: str, length: str, language: str) -> str:
+    """Hash the summary parameters and transcript into a cache key"""
+    return hashlib.sha256(f"{format_type}|{length}|{language}|{transcript}".encode()).hexdigest()
+
+async def generate_summary(transcript: str, format_type: str = "bullet_points", 
+                          length: str = "medium", language: str = "english") -> str:
     """Generate summary using OpenAI via LangChain"""
+    cache_key = summary_cache_key(transcript, format_type, length, language)
+    cached = app.state.summary_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        # Initialize ChatOpenAI
-        llm = ChatOpenAI(
-            openai_api_key=os.getenv('OPENAI_API_KEY'),
-            model_name="gpt-3.5-turbo",
-            temperature=0.3
-        )
+        prompt = await build_summary_prompt(transcript, format_type, length, language)
+        summary = (await complete_prompt(prompt)).strip()
+        app.state.summary_cache.set(cache_key, summary)
+        
+        return summary
         
-        # Create prompt
-        prompt_template = PromptTemplate(
-            input_variables=["transcript"],
-            template=get_summary_prompt(format_type, length, language)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating summary: {str(e)}")
+
+async def stream_summary(transcript: str, format_type: str, length: str, language: str):
+    """Generate summary like generate_summary, yielding the text as it is produced"""
+    cache_key = summary_cache_key(transcript, format_type, length, language)
+    cached = app.state.summary_cache.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+    
+    try:
+        prompt = await build_summary_prompt(transcript, format_type, length, language)
+        parts = []
+        async with app.state.llm_limiter:
+            async for chunk in app.state.llm.astream([HumanMessage(content=prompt)]):
+                parts.append(chunk.content)
+                yield chunk.content
+        app.state.summary_cache.set(cache_key, "".join(parts).strip())
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating summary: {str(e)}")
+
+async def build_summary_prompt(transcript: str, format_type: str, length: str, language: str) -> str:
+    """Build the final summary prompt, condensing transcripts too long for one prompt first"""
+    # Map: condense each chunk of a transcript that does not fit the model's
+    # context; complete_prompt caps how many chunks are sent at once.
+    # Collapse: if the joined section summaries still don't fit, condense them
+    # again, stopping early if a pass no longer shrinks the text
+    chunk_template = PromptTemplate(
+        input_variables=["transcript"],
+        template=get_chunk_summary_prompt()
+    )
+    transcript_tokens = await asyncio.to_thread(app.state.llm.get_num_tokens, transcript)
+    while transcript_tokens > TRANSCRIPT_TOKEN_BUDGET:
+        chunks = transcript_splitter.split_text(transcript)
+        chunk_summaries = await asyncio.gather(*[
+            complete_prompt(chunk_template.format(transcript=chunk)) for chunk in chunks
+        ])
+        transcript = "\n\n".join(chunk_summary.strip() for chunk_summary in chunk_summaries)
+        
+        previous_tokens = transcript_tokens
+        transcript_tokens = await asyncio.to_thread(app.state.llm.get_num_tokens, transcript)
+        if transcript_tokens >= previous_tokens:
+            break
+    
+    # Reduce: write the final summary in the requested format
+    prompt_template = PromptTemplate(
+        input_variables=["transcript"],
+        template=get_summary_prompt(format_type, length, language)
+    )
+    return prompt_template.format(transcript=transcript)
+
+async def complete_prompt(prompt: str) -> str:
+    """Complete one prompt, waiting for a free slot under LLM_CONCURRENCY"""
+    async with app.state.llm_limiter:
+        result = await app.state.llm.agenerate([[HumanMessage(content=prompt)]])
+    return result.generations[0][0].text
+
+async def run_cached_analysis(cache: LRUCache, text_hash: int, func, text: str):
+    """Run a pure text analysis in a worker thread, memoized by transcript hash"""
+    result = cache.get(text_hash)
+    if result is None:
+        result = await asyncio.to_thread(func, text)
+        cache.put(text_hash, result)
+    return result
+
+async def analyze_transcript(transcript: str, format_type: str, length: str,
+                             language: str, include_sentiment: bool):
+    """Run summarization, keyword extraction and sentiment analysis concurrently"""
+    text_hash = xxhash.xxh64_intdigest(transcript.encode())
+    jobs = [
+        generate_summary(transcript, format_type, length, language),
+        run_cached_analysis(keyword_cache, text_hash, extract_keywords, transcript)
+    ]
+    if include_sentiment:
+        jobs.append(run_cached_analysis(sentiment_cache, text_hash, analyze_sentiment, transcript))
+    
+    summary, keywords, *sentiment = await asyncio.gather(*jobs)
+    return summary, sentiment[0] if sentiment else None, keywords
+
+def progress_event(event_type: str, **fields) -> bytes:
+    """Encode one NDJSON progress event"""
+    return orjson.dumps({"type": event_type, **fields}) + b"\n"
+
+async def stream_analysis(load_source, format_type: str, length: str,
+                          language: str, include_sentiment: bool):
+    """Run the summarize pipeline, yielding NDJSON progress events as each stage finishes
+
+    load_source is a coroutine function returning (metadata, transcript).
+    """
+    keywords_task = sentiment_task = None
+    try:
+        metadata, transcript = await load_source()
+        yield progress_event("transcript_ready", metadata=metadata)
+        
+        # Keywords and sentiment run in the background while the summary streams
+        text_hash = xxhash.xxh64_intdigest(transcript.encode())
+        keywords_task = asyncio.create_task(
+            run_cached_analysis(keyword_cache, text_hash, extract_keywords, transcript)
         )
+        if include_sentiment:
+            sentiment_task = asyncio.create_task(
+                run_cached_analysis(sentiment_cache, text_hash, analyze_sentiment, transcript)
+            )
         
-        # Create chain
-        chain = LLMChain(llm=llm, prompt=prompt_template)
+        # The final prompt is streamed straight from the model, so it skips
+        # LangChain's SQLiteCache; summary_cache covers repeats
+        parts = []
+        async for text in stream_summary(transcript, format_type, length, language):
+            parts.append(text)
+            yield progress_event("summary_chunk", text=text)
         
-        # Generate summary
-        summary = chain.run(transcript=transcript)
+        sentiment = None
+        if sentiment_task:
+            sentiment = await sentiment_task
+            yield progress_event("sentiment_ready", sentiment=sentiment)
         
-        return summary.strip()
+        response = SummaryResponse(
+            id=str(uuid.uuid4()),
+            summary="".join(parts).strip(),
+            metadata=metadata,
+            transcript=transcript,
+            sentiment=sentiment,
+            keywords=await keywords_task,
+            timestamp=datetime.now().isoformat()
+        )
+        result = response.model_dump(mode="json")
+        await save_summary(result)
+        yield progress_event("result", result=result)
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating summary: {str(e)}")
+        yield progress_event("error", detail=getattr(e, 'detail', str(e)))
+    finally:
+        # A failed stage or a client that hung up leaves the side tasks pending
+        # or their failures unretrieved
+        for task in (keywords_task, sentiment_task):
+            if task is None:
+                continue
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()
+
+async def save_upload(file: UploadFile) -> tuple:
+    """Copy an uploaded video to a temporary file, returning its path and size"""
+    temp_path = tempfile.mktemp(suffix=os.path.splitext(file.filename)[1])
+    
+    file_size = 0
+    with open(temp_path, "wb") as buffer:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            buffer.write(chunk)
+            file_size += len(chunk)
+    
+    return temp_path, file_size
+
+def is_supported_video(filename: str) -> bool:
+    """Check the upload has a video extension we can decode"""
+    return filename.lower().endswith(('.mp4', '.avi', '.mov', '.mkv'))
+
+# Summary storage
+async def init_summary_db(db: aiosqlite.Connection):
+    """Create the summaries and transcripts tables and their indexes"""
+    await db.execute("PRAGMA journal_mode=WAL")
+    await db.execute(
+        "CREATE TABLE IF NOT EXISTS summaries "
+        "(id TEXT PRIMARY KEY, payload TEXT NOT NULL, ts INTEGER NOT NULL, transcript_hash TEXT)"
+    )
+    await db.execute(
+        "CREATE TABLE IF NOT EXISTS transcripts (hash TEXT PRIMARY KEY, text TEXT NOT NULL)"
+    )
+    await db.execute("CREATE INDEX IF NOT EXISTS summaries_ts ON summaries (ts)")
+    await db.execute("CREATE INDEX IF NOT EXISTS summaries_transcript ON summaries (transcript_hash)")
+    await db.commit()
+
+async def save_summary(summary: dict):
+    """Insert or replace a summary record, storing its transcript once by content hash"""
+    record = dict(summary)
+    transcript = record.pop('transcript')
+    record['transcript_hash'] = hashlib.sha1(transcript.encode()).hexdigest()
+    
+    async with app.state.db_lock:
+        await app.state.db.execute(
+            "INSERT OR IGNORE INTO transcripts (hash, text) VALUES (?, ?)",
+            (record['transcript_hash'], transcript)
+        )
+        await app.state.db.execute(
+            "INSERT OR REPLACE INTO summaries (id, payload, ts, transcript_hash) VALUES (?, ?, ?, ?)",
+            (record['id'], orjson.dumps(record).decode(), time.time_ns(), record['transcript_hash'])
+        )
+        await app.state.db.commit()
+
+async def load_summary_payload(summary_id: str) -> Optional[str]:
+    """Fetch the stored JSON payload of a summary by ID"""
+    async with app.state.db.execute("SELECT payload FROM summaries WHERE id = ?", (summary_id,)) as cursor:
+        row = await cursor.fetchone()
+    return row[0] if row else None
+
+async def load_summary(summary_id: str) -> Optional[dict]:
+    """Fetch a summary record by ID"""
+    payload = await load_summary_payload(summary_id)
+    return orjson.loads(payload) if payload else None
+
+async def load_transcript(transcript_hash: str) -> Optional[str]:
+    """Fetch a stored transcript by its content hash"""
+    async with app.state.db.execute("SELECT text FROM transcripts WHERE hash = ?", (transcript_hash,)) as cursor:
+        row = await cursor.fetchone()
+    return row[0] if row else None
+
+async def load_all_summary_payloads() -> List[str]:
+    """Fetch the stored JSON payload of every summary in the order it was created"""
+    async with app.state.db.execute("SELECT payload FROM summaries ORDER BY ts") as cursor:
+        rows = await cursor.fetchall()
+    return [row[0] for row in rows]
+
+async def remove_summary(summary_id: str):
+    """Delete a summary record by ID, and its transcript once no other summary uses it"""
+    db = app.state.db
+    async with app.state.db_lock:
+        async with db.execute("SELECT transcript_hash FROM summaries WHERE id = ?", (summary_id,)) as cursor:
+            row = await cursor.fetchone()
+        await db.execute("DELETE FROM summaries WHERE id = ?", (summary_id,))
+        if row and row[0]:
+            await db.execute(
+                "DELETE FROM transcripts WHERE hash = ? "
+                "AND NOT EXISTS (SELECT 1 FROM summaries WHERE transcript_hash = ?)",
+                (row[0], row[0])
+            )
+        await db.commit()
+
+# Lifecycle events
+@app.on_event("startup")
+async def startup_event():
+    """Open shared clients, the LLM response cache and the on-disk caches"""
+    app.state.http = httpx.AsyncClient(timeout=30)
+    app.state.llm = ChatOpenAI(
+        openai_api_key=os.getenv('OPENAI_API_KEY'),
+        model_name="gpt-3.5-turbo",
+        temperature=0.3,
+        max_retries=2,
+        request_timeout=30
+    )
+    app.state.llm_limiter = asyncio.Semaphore(LLM_CONCURRENCY)
+    
+    os.makedirs(DATA_DIR, exist_ok=True)
+    set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+    app.state.db = await aiosqlite.connect(SUMMARY_DB_PATH)
+    await init_summary_db(app.state.db)
+    app.state.db_lock = asyncio.Lock()  # Keeps each write's statements in one transaction
+    app.state.youtube_cache = diskcache.Cache(YOUTUBE_CACHE_DIR)
+    app.state.summary_cache = diskcache.Cache(
+        SUMMARY_CACHE_DIR,
+        size_limit=SUMMARY_CACHE_SIZE,
+        eviction_policy="least-recently-used"
+    )
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close shared clients and the on-disk caches"""
+    await app.state.http.aclose()
+    await app.state.db.close()
+    app.state.youtube_cache.close()
+    app.state.summary_cache.close()
 
 # API Endpoints
 @app.post("/summarize", response_model=SummaryResponse)
@@ -232,29 +626,22 @@ async def summarize_video(request: SummaryRequest):
         raise HTTPException(status_code=400, detail="URL is required")
     
     try:
-        # Extract video ID and get metadata
+        # Extract video ID, then fetch metadata and transcript concurrently
         video_id = extract_video_id(request.url)
-        metadata = get_video_metadata(video_id)
-        
-        # Extract transcript
-        transcript = extract_youtube_transcript(video_id)
+        metadata, transcript = await asyncio.gather(
+            get_video_metadata(video_id),
+            asyncio.to_thread(extract_youtube_transcript, video_id)
+        )
         
-        # Generate summary
-        summary = generate_summary(
+        # Generate summary, keywords and optional sentiment analysis
+        summary, sentiment, keywords = await analyze_transcript(
             transcript, 
             request.format, 
             request.length, 
-            request.language
+            request.language,
+            request.include_sentiment
         )
         
-        # Optional sentiment analysis
-        sentiment = None
-        if request.include_sentiment:
-            sentiment = analyze_sentiment(transcript)
-        
-        # Extract keywords
-        keywords = extract_keywords(transcript)
-        
         # Create response
         response = SummaryResponse(
             id=str(uuid.uuid4()),
@@ -266,8 +653,8 @@ async def summarize_video(request: SummaryRequest):
             timestamp=datetime.now().isoformat()
         )
         
-        # Store in memory (replace with database in production)
-        summary_storage.append(response.dict())
+        # Persist to the summaries database
+        await save_summary(response.model_dump(mode="json"))
         
         return response
         
@@ -284,35 +671,25 @@ async def summarize_uploaded_video(
 ):
     """Summarize uploaded video file"""
     
-    if not file.filename.lower().endswith(('.mp4', '.avi', '.mov', '.mkv')):
+    if not is_supported_video(file.filename):
         raise HTTPException(status_code=400, detail="Unsupported file format")
     
     try:
         # Save uploaded file temporarily
-        temp_path = tempfile.mktemp(suffix=os.path.splitext(file.filename)[1])
-        
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        temp_path, file_size = await save_upload(file)
         
         # Extract transcript from video file
-        transcript = extract_audio_transcript(temp_path)
+        transcript = await asyncio.to_thread(extract_audio_transcript, temp_path)
         
-        # Generate summary
-        summary = generate_summary(transcript, format, length, language)
-        
-        # Optional sentiment analysis
-        sentiment = None
-        if include_sentiment:
-            sentiment = analyze_sentiment(transcript)
-        
-        # Extract keywords
-        keywords = extract_keywords(transcript)
+        # Generate summary, keywords and optional sentiment analysis
+        summary, sentiment, keywords = await analyze_transcript(
+            transcript, format, length, language, include_sentiment
+        )
         
         # Create metadata for uploaded file
         metadata = {
             "title": file.filename,
-            "file_size": len(content),
+            "file_size": file_size,
             "file_type": file.content_type
         }
         
@@ -327,8 +704,8 @@ async def summarize_uploaded_video(
             timestamp=datetime.now().isoformat()
         )
         
-        # Store in memory
-        summary_storage.append(response.dict())
+        # Persist to the summaries database
+        await save_summary(response.model_dump(mode="json"))
         
         # Cleanup
         os.remove(temp_path)
@@ -338,42 +715,106 @@ async def summarize_uploaded_video(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/summarize/stream")
+async def summarize_video_stream(request: SummaryRequest):
+    """Summarize video from URL, streaming NDJSON progress events and summary text"""
+    
+    if not request.url:
+        raise HTTPException(status_code=400, detail="URL is required")
+    
+    try:
+        video_id = extract_video_id(request.url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def load_source():
+        # Fetch metadata and transcript concurrently
+        return await asyncio.gather(
+            get_video_metadata(video_id),
+            asyncio.to_thread(extract_youtube_transcript, video_id)
+        )
+    
+    return StreamingResponse(
+        stream_analysis(load_source, request.format, request.length,
+                        request.language, request.include_sentiment),
+        media_type="application/x-ndjson"
+    )
+
+@app.post("/summarize/upload/stream")
+async def summarize_uploaded_video_stream(
+    file: UploadFile = File(...),
+    format: str = Form("bullet_points"),
+    length: str = Form("medium"),
+    language: str = Form("english"),
+    include_sentiment: bool = Form(False)
+):
+    """Summarize uploaded video file, streaming NDJSON progress events and summary text"""
+    
+    if not is_supported_video(file.filename):
+        raise HTTPException(status_code=400, detail="Unsupported file format")
+    
+    # Save before streaming starts; the temp file is removed once the stream ends
+    temp_path, file_size = await save_upload(file)
+    metadata = {
+        "title": file.filename,
+        "file_size": file_size,
+        "file_type": file.content_type
+    }
+    
+    async def load_source():
+        transcript = await asyncio.to_thread(extract_audio_transcript, temp_path)
+        return metadata, transcript
+    
+    return StreamingResponse(
+        stream_analysis(load_source, format, length, language, include_sentiment),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(os.remove, temp_path)
+    )
+
 @app.get("/summaries/{summary_id}")
 async def get_summary(summary_id: str):
-    """Get specific summary by ID"""
-    for summary in summary_storage:
-        if summary['id'] == summary_id:
-            return summary
-    raise HTTPException(status_code=404, detail="Summary not found")
+    """Get specific summary by ID, including its full transcript"""
+    summary = await load_summary(summary_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Summary not found")
+    if 'transcript_hash' in summary:
+        summary['transcript'] = await load_transcript(summary['transcript_hash'])
+    return summary
 
 @app.get("/summaries")
 async def get_all_summaries():
-    """Get all stored summaries"""
-    return summary_storage
+    """Get all stored summaries; transcripts are referenced by transcript_hash"""
+    # Stored payloads are already JSON, so pass them through without re-encoding
+    payloads = await load_all_summary_payloads()
+    return Response(content=f"[{','.join(payloads)}]", media_type="application/json")
+
+@app.get("/transcript/{summary_id}")
+async def get_summary_transcript(summary_id: str):
+    """Get only the transcript of a stored summary"""
+    summary = await load_summary(summary_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Summary not found")
+    # Records saved before transcripts moved to their own table keep them inline
+    if 'transcript_hash' in summary:
+        transcript = await load_transcript(summary['transcript_hash'])
+    else:
+        transcript = summary.get('transcript')
+    return {"transcript": transcript or ""}
 
 @app.delete("/summaries/{summary_id}")
 async def delete_summary(summary_id: str):
     """Delete specific summary"""
-    global summary_storage
-    summary_storage = [s for s in summary_storage if s['id'] != summary_id]
+    await remove_summary(summary_id)
     return {"message": "Summary deleted"}
 
 @app.get("/download/{summary_id}")
 async def download_summary(summary_id: str, format: str = "txt"):
     """Download summary in specified format"""
     
-    summary = None
-    for s in summary_storage:
-        if s['id'] == summary_id:
-            summary = s
-            break
-    
+    summary = await load_summary(summary_id)
     if not summary:
         raise HTTPException(status_code=404, detail="Summary not found")
     
-    # Create temporary file with summary content
-    temp_path = tempfile.mktemp(suffix=f".{format}")
-    
     content = f"""Title: {summary['metadata'].get('title', 'N/A')}
 Generated: {summary['timestamp']}
 
@@ -386,13 +827,10 @@ Keywords: {', '.join(summary.get('keywords', []))}
     if summary.get('sentiment'):
         content += f"\nSentiment: {summary['sentiment']['overall']} (Score: {summary['sentiment']['compound']:.2f})"
     
-    with open(temp_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    
-    return FileResponse(
-        temp_path, 
-        filename=f"summary_{summary_id}.{format}",
-        media_type='application/octet-stream'
+    return Response(
+        content=content.encode('utf-8'),
+        media_type='text/plain',
+        headers={"Content-Disposition": f'attachment; filename="summary_{summary_id}.{format}"'}
     )
 
 @app.get("/health")
@@ -402,4 +840,13 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Summaries live in SQLite and caches on disk, so workers share state
+    uvicorn.run(
+        "backend:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv('WEB_CONCURRENCY', os.cpu_count() or 1)),
+        loop="uvloop",
+        http="httptools",
+        log_level="info"
+    )
@@ -2,14 +2,18 @@
 
 import streamlit as st
 import requests
-import json
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+import orjson
+import re
+import collections
+from itertools import islice
+import time
 from datetime import datetime
-import base64
-import io
-import matplotlib.pyplot as plt
-import plotly.express as px
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 # Configure Streamlit page
 st.set_page_config(
@@ -20,7 +24,10 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+@st.cache_resource
+def get_custom_css() -> str:
+    """Build the CSS block once; every rerun then emits the identical string"""
+    return """
 <style>
     .main {
         padding-top: 1rem;
@@ -40,39 +47,115 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# The element must be emitted on every run or Streamlit removes it, but an
+# unchanged string lets the frontend skip the DOM update
+st.markdown(get_custom_css(), unsafe_allow_html=True)
 
 # Backend API URL (adjust as needed)
 API_BASE_URL = "http://localhost:8000"
 
+# Display labels for sidebar options and sentiment values
+FORMAT_LABELS = {
+    "bullet_points": "• Bullet Points",
+    "narrative": "📖 Narrative Story", 
+    "markdown": "📝 Markdown Format"
+}
+LENGTH_LABELS = {
+    "short": "📄 Short (100-150 words)",
+    "medium": "📄 Medium (200-300 words)",
+    "long": "📄 Long (400-500 words)"
+}
+LANGUAGE_LABELS = {
+    "english": "🇺🇸 English",
+    "spanish": "🇪🇸 Spanish", 
+    "french": "🇫🇷 French",
+    "german": "🇩🇪 German",
+    "japanese": "🇯🇵 Japanese",
+    "chinese": "🇨🇳 Chinese"
+}
+SENTIMENT_EMOJI = {
+    'positive': '😊',
+    'negative': '😞', 
+    'neutral': '😐'
+}
+
+# Uploads larger than this are sent with a lazily encoded multipart body
+MULTIPART_STREAM_THRESHOLD = 64 * 1024 * 1024
+
+# History keeps the most recent summaries only and shows them a page at a time
+HISTORY_LIMIT = 50
+HISTORY_PAGE_SIZE = 10
+
+# Minimum seconds between redraws of the streaming summary (~20 Hz)
+STREAM_RENDER_INTERVAL = 0.05
+
+# YouTube video ID in watch, short-link, shorts, embed and live URLs (mirrors the backend)
+VIDEO_ID_PATTERN = re.compile(r'(?:v=|youtu\.be/|/shorts/|/embed/|/live/|/v/)([0-9A-Za-z_-]{11})')
+
 # Helper functions
-def extract_video_id(url: str) -> str:
+@st.cache_resource
+def get_http() -> requests.Session:
+    """Shared HTTP session so backend calls reuse pooled keep-alive connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    return session
+
+def parse_json(response: requests.Response):
+    """Decode a JSON response body with orjson"""
+    return orjson.loads(response.content)
+
+@st.cache_data(max_entries=256)
+def extract_video_id(url: str) -> Optional[str]:
     """Extract video ID from YouTube URL for thumbnail display"""
-    import re
-    pattern = r'(?:v=|\/)([0-9A-Za-z_-]{11}).*'
-    match = re.search(pattern, url)
+    match = VIDEO_ID_PATTERN.search(url)
     return match.group(1) if match else None
 
+@st.cache_data(max_entries=256)
 def get_thumbnail_url(video_id: str) -> str:
     """Get YouTube thumbnail URL"""
     return f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
 
-def create_sentiment_chart(sentiment_data: Dict) -> plt.Figure:
+@st.cache_data(ttl=3600, max_entries=64)
+def fetch_thumbnail(video_id: str) -> bytes:
+    """Download thumbnail bytes once so reruns don't refetch the image"""
+    response = get_http().get(get_thumbnail_url(video_id), timeout=5)
+    if response.status_code == 404:
+        # Not every video has a max-resolution thumbnail; hqdefault always exists
+        response = get_http().get(f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg", timeout=5)
+    response.raise_for_status()
+    return response.content
+
+def create_sentiment_chart(sentiment_data: Dict) -> "go.Figure":
     """Create a pie chart for sentiment analysis"""
     if not sentiment_data:
         return None
     
-    labels = ['Positive', 'Neutral', 'Negative']
-    sizes = [
+    # Pass plain scores so the cached builder is keyed on values, not the dict
+    return build_sentiment_chart(
         sentiment_data.get('positive', 0),
         sentiment_data.get('neutral', 0), 
         sentiment_data.get('negative', 0)
-    ]
-    colors = ['#4CAF50', '#FFC107', '#F44336']
-    
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-    ax.set_title('Sentiment Analysis Distribution')
+    )
+
+@st.cache_data(max_entries=64)
+def build_sentiment_chart(positive: float, neutral: float, negative: float) -> "go.Figure":
+    """Build the sentiment pie chart once per distinct set of scores"""
+    # Imported here so plotly only loads once a chart is actually drawn
+    import plotly.express as px
+    
+    fig = px.pie(
+        values=[positive, neutral, negative],
+        names=['Positive', 'Neutral', 'Negative'],
+        color_discrete_sequence=['#4CAF50', '#FFC107', '#F44336'],
+        hole=0.3,
+        title='Sentiment Analysis Distribution'
+    )
+    fig.update_traces(textinfo='percent+label', sort=False)
     return fig
 
 def display_video_info(metadata: Dict):
@@ -105,9 +188,343 @@ def display_video_info(metadata: Dict):
         else:
             st.metric("Published", "N/A")
 
+def render_preview(url: str, video_id: str):
+    """Display the video thumbnail and embedded player"""
+    st.subheader("📺 Video Preview")
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        # Display thumbnail; the player below still works if img.youtube.com doesn't
+        try:
+            st.image(fetch_thumbnail(video_id), use_column_width=True)
+        except requests.exceptions.RequestException:
+            st.caption("🖼️ Thumbnail unavailable")
+    
+    with col2:
+        # Embed video player
+        st.video(url)
+
+def consume_summary_stream(response: requests.Response) -> Optional[Dict]:
+    """Show NDJSON progress events as they arrive and return the final result"""
+    status = st.empty()
+    summary_placeholder = st.empty()
+    status.info("🔄 Fetching transcript...")
+    
+    chunks = []
+    last_render = 0.0
+    result = None
+    error = None
+    
+    # Closing the response returns its connection to the session's pool even
+    # when we stop reading early
+    with response:
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = orjson.loads(line)
+            
+            if event['type'] == 'transcript_ready':
+                status.info("✍️ Transcript ready, writing summary...")
+            elif event['type'] == 'summary_chunk':
+                chunks.append(event['text'])
+                # Throttle redraws so rendering partial text doesn't become the bottleneck
+                now = time.monotonic()
+                if now - last_render >= STREAM_RENDER_INTERVAL:
+                    summary_placeholder.markdown("".join(chunks))
+                    last_render = now
+            elif event['type'] == 'sentiment_ready':
+                status.info("📊 Sentiment analysis ready, finishing up...")
+            elif event['type'] == 'result':
+                result = event['result']
+                break
+            elif event['type'] == 'error':
+                error = event.get('detail', 'Unknown error')
+                break
+    
+    # The full result view replaces the streamed preview
+    status.empty()
+    summary_placeholder.empty()
+    
+    if result is None:
+        st.error(f"❌ Error: {error or 'The backend closed the stream before the summary was finished'}")
+    return result
+
+def post_upload(url: str, uploaded_file, data: Dict) -> requests.Response:
+    """Post an uploaded video without copying it into an intermediate bytes object"""
+    uploaded_file.seek(0)
+    file_field = (uploaded_file.name, uploaded_file, uploaded_file.type)
+    
+    if uploaded_file.size > MULTIPART_STREAM_THRESHOLD:
+        # Encode the multipart body as it is sent instead of building it up front
+        encoder = MultipartEncoder(fields={**data, "file": file_field})
+        return get_http().post(url, data=encoder, headers={"Content-Type": encoder.content_type}, stream=True)
+    
+    return get_http().post(url, files={"file": file_field}, data=data, stream=True)
+
+def remember_summary(result: Dict):
+    """Add the fields the History page shows to the session history"""
+    # Session state is serialized on every rerun, so the transcript stays on the backend
+    entry = {key: result[key] for key in ('id', 'timestamp', 'metadata', 'summary', 'keywords')}
+    entry['sentiment_overall'] = (result.get('sentiment') or {}).get('overall')
+    st.session_state.summary_history.append(entry)
+
+@st.cache_data(ttl=600)
+def get_transcript(summary_id: str) -> str:
+    """Fetch a stored summary's transcript from the backend"""
+    response = get_http().get(f"{API_BASE_URL}/transcript/{summary_id}")
+    response.raise_for_status()
+    return parse_json(response)['transcript']
+
+def toggle_history_entry(open_key: str):
+    """Open or close a History entry before the rerun renders it"""
+    st.session_state[open_key] = not st.session_state.get(open_key, False)
+
+def delete_history_entry(summary_id: str):
+    """Remove a summary from the session history"""
+    history = st.session_state.summary_history
+    st.session_state.summary_history = collections.deque(
+        (entry for entry in history if entry['id'] != summary_id), maxlen=HISTORY_LIMIT
+    )
+    st.session_state.pop(f"open_{summary_id}", None)
+    st.toast("Summary deleted!")
+
+def clear_history():
+    """Drop every summary from the session history"""
+    st.session_state.summary_history = collections.deque(maxlen=HISTORY_LIMIT)
+
+def display_file_info(metadata: Dict):
+    """Display uploaded file details"""
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("File Size", f"{metadata.get('file_size', 0) / (1024*1024):.1f} MB")
+    with col2:
+        st.metric("File Type", metadata.get('file_type', 'N/A'))
+
+@st.cache_data(ttl=600)
+def fetch_download(summary_id: str, fmt: str) -> bytes:
+    """Fetch a rendered summary file from the backend, once per summary and format"""
+    response = get_http().get(f"{API_BASE_URL}/download/{summary_id}", params={"format": fmt})
+    response.raise_for_status()
+    return response.content
+
+# Fragments take no per-result arguments: Streamlit keeps the arguments of a
+# fragment's first call and reuses them on its own reruns, so they read the
+# result being shown from st.session_state.current_result instead
+@st.fragment
+def render_text_download():
+    """Text download button; reruns on its own without redrawing the results"""
+    result = st.session_state.current_result
+    try:
+        data = fetch_download(result['id'], "txt")
+    except requests.exceptions.RequestException:
+        st.warning("⚠️ Text download is unavailable")
+        return
+    
+    st.download_button(
+        label="📄 Download as Text",
+        data=data,
+        file_name=f"summary_{result['id']}.txt",
+        mime="text/plain"
+    )
+
+@st.fragment
+def render_markdown_download():
+    """Markdown download button; reruns on its own without redrawing the results"""
+    result = st.session_state.current_result
+    st.download_button(
+        label="📝 Download as Markdown",
+        data=f"# Video Summary\n\n{result['summary']}",
+        file_name=f"summary_{result['id']}.md",
+        mime="text/markdown"
+    )
+
+@st.fragment
+def render_result():
+    """Display the current summary; interactions here only rerun this fragment"""
+    result = st.session_state.current_result
+    include_sentiment = st.session_state.current_include_sentiment
+    
+    # Create tabs for different views
+    result_tab1, result_tab2, result_tab3, result_tab4 = st.tabs([
+        "📝 Summary", "📊 Details", "🎯 Sentiment", "📋 Full Transcript"
+    ])
+    
+    with result_tab1:
+        st.subheader("📝 Generated Summary")
+        st.markdown(result['summary'])
+        
+        # Download options
+        st.subheader("💾 Download Options")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            render_text_download()
+        
+        with col2:
+            render_markdown_download()
+    
+    with result_tab2:
+        metadata = result.get('metadata', {})
+        if 'file_size' in metadata:
+            st.subheader("📁 File Details")
+            display_file_info(metadata)
+        else:
+            st.subheader("📊 Video Information")
+            display_video_info(metadata)
+        
+        # Keywords section
+        if result.get('keywords'):
+            st.subheader("🔍 Key Topics")
+            st.table([
+                {'Keywords': keyword, 'Relevance': f"#{i+1}"}
+                for i, keyword in enumerate(result['keywords'][:10])
+            ])
+    
+    with result_tab3:
+        if result.get('sentiment') and include_sentiment:
+            st.subheader("📊 Sentiment Analysis")
+            
+            sentiment = result['sentiment']
+            
+            # Display overall sentiment
+            overall_sentiment = sentiment.get('overall', 'neutral')
+            
+            st.metric(
+                "Overall Sentiment", 
+                f"{SENTIMENT_EMOJI.get(overall_sentiment, '😐')} {overall_sentiment.title()}",
+                f"Score: {sentiment.get('compound', 0):.2f}"
+            )
+            
+            # Create sentiment chart
+            fig = create_sentiment_chart(sentiment)
+            if fig:
+                st.plotly_chart(fig, use_container_width=True)
+                
+            # Detailed scores
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("😊 Positive", f"{sentiment.get('positive', 0):.1%}")
+            with col2:
+                st.metric("😐 Neutral", f"{sentiment.get('neutral', 0):.1%}")
+            with col3:
+                st.metric("😞 Negative", f"{sentiment.get('negative', 0):.1%}")
+        else:
+            st.info("Sentiment analysis not included. Enable it in the sidebar settings.")
+    
+    with result_tab4:
+        st.subheader("📋 Full Video Transcript")
+        with st.expander("Click to view full transcript", expanded=False):
+            st.text_area(
+                "Transcript:", 
+                result['transcript'], 
+                height=300,
+                disabled=True
+            )
+
+@st.fragment
+def history_list():
+    """History entries; deleting one redraws only this fragment"""
+    if st.session_state.summary_history:
+        history = st.session_state.summary_history
+        st.info(f"📊 Total summaries: {len(history)} (last {HISTORY_LIMIT} are kept)")
+        
+        # Only materialize widgets for one page of entries
+        page_count = (len(history) + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+        page_index = 0
+        if page_count > 1:
+            page_index = st.number_input("Page", min_value=1, max_value=page_count, value=1) - 1
+        page_start = page_index * HISTORY_PAGE_SIZE
+        page_entries = islice(reversed(history), page_start, page_start + HISTORY_PAGE_SIZE)
+        
+        # Display summaries in reverse chronological order. Only the header row
+        # is built eagerly; an entry's widgets exist only while it is open
+        for i, summary in enumerate(page_entries, start=page_start):
+            open_key = f"open_{summary['id']}"
+            is_open = st.session_state.get(open_key, False)
+            
+            col_title, col_open = st.columns([6, 1])
+            
+            with col_title:
+                st.markdown(f"**📝 {summary['metadata'].get('title', f'Summary {len(history)-i}')} - {summary['timestamp'][:19]}**")
+            
+            with col_open:
+                st.button(
+                    "🔼 Close" if is_open else "🔽 Open",
+                    key=f"toggle_{summary['id']}",
+                    on_click=toggle_history_entry,
+                    args=(open_key,)
+                )
+            
+            if not is_open:
+                continue
+            
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown("**Summary:**")
+                st.markdown(summary['summary'][:500] + "..." if len(summary['summary']) > 500 else summary['summary'])
+            
+            with col2:
+                if summary.get('sentiment_overall'):
+                    sentiment = summary['sentiment_overall']
+                    st.metric("Sentiment", f"{SENTIMENT_EMOJI.get(sentiment, '😐')} {sentiment.title()}")
+                
+                if summary.get('keywords'):
+                    st.markdown("**Top Keywords:**")
+                    st.write(", ".join(summary['keywords'][:5]))
+            
+            # Action buttons
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                if st.button(f"📄 View Full", key=f"view_{summary['id']}"):
+                    st.json(summary)
+                    try:
+                        transcript = get_transcript(summary['id'])
+                    except requests.exceptions.RequestException:
+                        st.warning("Transcript is no longer available on the backend")
+                    else:
+                        st.text_area("Transcript", transcript, height=200, key=f"transcript_{summary['id']}")
+            
+            with col2:
+                if st.button(f"💾 Download", key=f"download_{summary['id']}"):
+                    download_content = f"""
+Title: {summary['metadata'].get('title', 'N/A')}
+Generated: {summary['timestamp']}
+
+Summary:
+{summary['summary']}
+
+Keywords: {', '.join(summary.get('keywords', []))}
+"""
+                    st.download_button(
+                        label="📥 Download",
+                        data=download_content,
+                        file_name=f"summary_{summary['id']}.txt",
+                        mime="text/plain",
+                        key=f"dl_btn_{summary['id']}"
+                    )
+            
+            with col3:
+                st.button(
+                    f"🗑️ Delete",
+                    key=f"delete_{summary['id']}",
+                    on_click=delete_history_entry,
+                    args=(summary['id'],)
+                )
+            
+            st.divider()
+    else:
+        st.info("📭 No summaries yet. Go to 'Summarize Video' to create your first summary!")
+        
+        if st.button("🚀 Start Summarizing"):
+            st.session_state.page = "Summarize Video"
+            st.rerun()
+
 # Initialize session state
 if 'summary_history' not in st.session_state:
-    st.session_state.summary_history = []
+    st.session_state.summary_history = collections.deque(maxlen=HISTORY_LIMIT)
 
 # Main app layout
 st.title("🎥 Ultimate Video Summarizer Agent")
@@ -126,38 +543,23 @@ with st.sidebar:
     # Summary format options
     summary_format = st.selectbox(
         "Summary Format:",
-        ["bullet_points", "narrative", "markdown"],
-        format_func=lambda x: {
-            "bullet_points": "• Bullet Points",
-            "narrative": "📖 Narrative Story", 
-            "markdown": "📝 Markdown Format"
-        }[x]
+        list(FORMAT_LABELS),
+        format_func=FORMAT_LABELS.get
     )
     
     # Summary length
     summary_length = st.selectbox(
         "Summary Length:",
-        ["short", "medium", "long"],
+        list(LENGTH_LABELS),
         index=1,
-        format_func=lambda x: {
-            "short": "📄 Short (100-150 words)",
-            "medium": "📄 Medium (200-300 words)",
-            "long": "📄 Long (400-500 words)"
-        }[x]
+        format_func=LENGTH_LABELS.get
     )
     
     # Language selection
     language = st.selectbox(
         "Output Language:",
-        ["english", "spanish", "french", "german", "japanese", "chinese"],
-        format_func=lambda x: {
-            "english": "🇺🇸 English",
-            "spanish": "🇪🇸 Spanish", 
-            "french": "🇫🇷 French",
-            "german": "🇩🇪 German",
-            "japanese": "🇯🇵 Japanese",
-            "chinese": "🇨🇳 Chinese"
-        }[x]
+        list(LANGUAGE_LABELS),
+        format_func=LANGUAGE_LABELS.get
     )
     
     # Include sentiment analysis
@@ -167,10 +569,8 @@ with st.sidebar:
     
     # Data management
     st.header("🗂️ Data Management")
-    if st.button("🗑️ Clear History", type="secondary"):
-        st.session_state.summary_history = []
+    if st.button("🗑️ Clear History", type="secondary", on_click=clear_history):
         st.success("History cleared!")
-        st.rerun()
 
 # Main content area
 if page == "Summarize Video":
@@ -181,38 +581,28 @@ if page == "Summarize Video":
     with tab1:
         st.header("🔗 Summarize YouTube Video")
         
-        col1, col2 = st.columns([3, 1])
-        
-        with col1:
-            video_url = st.text_input(
-                "Enter YouTube URL:",
-                placeholder="https://www.youtube.com/watch?v=...",
-                help="Paste any YouTube video URL here"
-            )
-        
-        with col2:
-            st.write("") # Spacer
-            st.write("") # Spacer
-            generate_btn = st.button("🚀 Generate Summary", type="primary", use_container_width=True)
+        # A form only reruns the script on submit, not while the URL is being edited
+        with st.form("url_form"):
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                video_url = st.text_input(
+                    "Enter YouTube URL:",
+                    placeholder="https://www.youtube.com/watch?v=...",
+                    help="Paste any YouTube video URL here"
+                )
+            
+            with col2:
+                st.write("") # Spacer
+                st.write("") # Spacer
+                generate_btn = st.form_submit_button("🚀 Generate Summary", type="primary", use_container_width=True)
         
-        # Preview video if URL is provided
+        # Preview video once a URL has been submitted
         if video_url:
-            try:
-                video_id = extract_video_id(video_url)
-                if video_id:
-                    st.subheader("📺 Video Preview")
-                    
-                    col1, col2 = st.columns([1, 2])
-                    
-                    with col1:
-                        # Display thumbnail
-                        thumbnail_url = get_thumbnail_url(video_id)
-                        st.image(thumbnail_url, use_column_width=True)
-                    
-                    with col2:
-                        # Embed video player
-                        st.video(video_url)
-            except:
+            video_id = extract_video_id(video_url)
+            if video_id:
+                render_preview(video_url, video_id)
+            else:
                 st.warning("⚠️ Invalid YouTube URL format")
         
         # Generate summary when button is clicked
@@ -228,112 +618,25 @@ if page == "Summarize Video":
                         "include_sentiment": include_sentiment
                     }
                     
-                    # Make API request
-                    response = requests.post(f"{API_BASE_URL}/summarize", json=payload)
+                    # Make API request, streaming progress and summary text as they arrive
+                    response = get_http().post(f"{API_BASE_URL}/summarize/stream", json=payload, stream=True)
                     
                     if response.status_code == 200:
-                        result = response.json()
-                        
-                        # Store in session state
-                        st.session_state.summary_history.append(result)
-                        
-                        # Display results
-                        st.success("✅ Summary generated successfully!")
-                        
-                        # Create tabs for different views
-                        result_tab1, result_tab2, result_tab3, result_tab4 = st.tabs([
-                            "📝 Summary", "📊 Details", "🎯 Sentiment", "📋 Full Transcript"
-                        ])
+                        result = consume_summary_stream(response)
                         
-                        with result_tab1:
-                            st.subheader("📝 Generated Summary")
-                            st.markdown(result['summary'])
-                            
-                            # Download options
-                            st.subheader("💾 Download Options")
-                            col1, col2, col3 = st.columns(3)
+                        if result:
+                            # Store in session state
+                            remember_summary(result)
                             
-                            with col1:
-                                if st.button("📄 Download as Text"):
-                                    download_response = requests.get(f"{API_BASE_URL}/download/{result['id']}?format=txt")
-                                    if download_response.status_code == 200:
-                                        st.download_button(
-                                            label="📥 Download Text File",
-                                            data=download_response.content,
-                                            file_name=f"summary_{result['id']}.txt",
-                                            mime="text/plain"
-                                        )
+                            # Display results
+                            st.success("✅ Summary generated successfully!")
                             
-                            with col2:
-                                if st.button("📝 Download as Markdown"):
-                                    st.download_button(
-                                        label="📥 Download Markdown",
-                                        data=f"# Video Summary\\n\\n{result['summary']}",
-                                        file_name=f"summary_{result['id']}.md",
-                                        mime="text/markdown"
-                                    )
-                        
-                        with result_tab2:
-                            st.subheader("📊 Video Information")
-                            display_video_info(result['metadata'])
-                            
-                            # Keywords section
-                            if result.get('keywords'):
-                                st.subheader("🔍 Key Topics")
-                                keywords_df = pd.DataFrame({
-                                    'Keywords': result['keywords'][:10],
-                                    'Relevance': [f"#{i+1}" for i in range(len(result['keywords'][:10]))]
-                                })
-                                st.dataframe(keywords_df, use_container_width=True)
-                        
-                        with result_tab3:
-                            if result.get('sentiment') and include_sentiment:
-                                st.subheader("📊 Sentiment Analysis")
-                                
-                                sentiment = result['sentiment']
-                                
-                                # Display overall sentiment
-                                overall_sentiment = sentiment.get('overall', 'neutral')
-                                sentiment_emoji = {
-                                    'positive': '😊',
-                                    'negative': '😞', 
-                                    'neutral': '😐'
-                                }
-                                
-                                st.metric(
-                                    "Overall Sentiment", 
-                                    f"{sentiment_emoji.get(overall_sentiment, '😐')} {overall_sentiment.title()}",
-                                    f"Score: {sentiment.get('compound', 0):.2f}"
-                                )
-                                
-                                # Create sentiment chart
-                                fig = create_sentiment_chart(sentiment)
-                                if fig:
-                                    st.pyplot(fig)
-                                    
-                                # Detailed scores
-                                col1, col2, col3 = st.columns(3)
-                                with col1:
-                                    st.metric("😊 Positive", f"{sentiment.get('positive', 0):.1%}")
-                                with col2:
-                                    st.metric("😐 Neutral", f"{sentiment.get('neutral', 0):.1%}")
-                                with col3:
-                                    st.metric("😞 Negative", f"{sentiment.get('negative', 0):.1%}")
-                            else:
-                                st.info("Sentiment analysis not included. Enable it in the sidebar settings.")
-                        
-                        with result_tab4:
-                            st.subheader("📋 Full Video Transcript")
-                            with st.expander("Click to view full transcript", expanded=False):
-                                st.text_area(
-                                    "Transcript:", 
-                                    result['transcript'], 
-                                    height=300,
-                                    disabled=True
-                                )
+                            st.session_state.current_result = result
+                            st.session_state.current_include_sentiment = include_sentiment
+                            render_result()
                     
                     else:
-                        st.error(f"❌ Error: {response.json().get('detail', 'Unknown error')}")
+                        st.error(f"❌ Error: {parse_json(response).get('detail', 'Unknown error')}")
                         
                 except requests.exceptions.ConnectionError:
                     st.error("❌ Cannot connect to backend API. Please ensure the backend is running on port 8000.")
@@ -368,55 +671,32 @@ if page == "Summarize Video":
             if st.button("🚀 Analyze Uploaded Video", type="primary"):
                 with st.spinner("🔄 Processing uploaded video... This may take several minutes"):
                     try:
-                        # Prepare files and data for upload
-                        files = {"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)}
+                        # Prepare form data for upload
                         data = {
                             "format": file_format,
                             "length": file_length,
                             "language": file_language,
-                            "include_sentiment": file_sentiment
+                            "include_sentiment": str(file_sentiment).lower()
                         }
                         
-                        # Make API request
-                        response = requests.post(f"{API_BASE_URL}/summarize/upload", files=files, data=data)
+                        # Make API request, streaming progress and summary text as they arrive
+                        response = post_upload(f"{API_BASE_URL}/summarize/upload/stream", uploaded_file, data)
                         
                         if response.status_code == 200:
-                            result = response.json()
-                            
-                            # Store in session state
-                            st.session_state.summary_history.append(result)
-                            
-                            st.success("✅ Video analyzed successfully!")
-                            
-                            # Display results (similar to URL tab)
-                            st.subheader("📝 Analysis Results")
+                            result = consume_summary_stream(response)
                             
-                            # Summary
-                            st.markdown("**Summary:**")
-                            st.markdown(result['summary'])
-                            
-                            # File details
-                            if result.get('metadata'):
-                                st.markdown("**File Details:**")
-                                metadata = result['metadata']
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    st.metric("File Size", f"{metadata.get('file_size', 0) / (1024*1024):.1f} MB")
-                                with col2:
-                                    st.metric("File Type", metadata.get('file_type', 'N/A'))
-                            
-                            # Sentiment and keywords (if available)
-                            if result.get('sentiment') and file_sentiment:
-                                st.markdown("**Sentiment Analysis:**")
-                                sentiment = result['sentiment']
-                                st.metric("Overall Sentiment", sentiment.get('overall', 'neutral').title())
-                            
-                            if result.get('keywords'):
-                                st.markdown("**Key Topics:**")
-                                st.write(", ".join(result['keywords'][:10]))
+                            if result:
+                                # Store in session state
+                                remember_summary(result)
+                                
+                                st.success("✅ Video analyzed successfully!")
+                                
+                                st.session_state.current_result = result
+                                st.session_state.current_include_sentiment = file_sentiment
+                                render_result()
                         
                         else:
-                            st.error(f"❌ Error: {response.json().get('detail', 'Unknown error')}")
+                            st.error(f"❌ Error: {parse_json(response).get('detail', 'Unknown error')}")
                     
                     except Exception as e:
                         st.error(f"❌ An error occurred: {str(e)}")
@@ -424,68 +704,7 @@ if page == "Summarize Video":
 elif page == "History":
     st.header("📜 Summary History")
     
-    if st.session_state.summary_history:
-        st.info(f"📊 Total summaries: {len(st.session_state.summary_history)}")
-        
-        # Display summaries in reverse chronological order
-        for i, summary in enumerate(reversed(st.session_state.summary_history)):
-            with st.expander(f"📝 {summary['metadata'].get('title', f'Summary {len(st.session_state.summary_history)-i}')} - {summary['timestamp'][:19]}"):
-                
-                col1, col2 = st.columns([3, 1])
-                
-                with col1:
-                    st.markdown("**Summary:**")
-                    st.markdown(summary['summary'][:500] + "..." if len(summary['summary']) > 500 else summary['summary'])
-                
-                with col2:
-                    if summary.get('sentiment'):
-                        sentiment = summary['sentiment']['overall']
-                        emoji = {'positive': '😊', 'negative': '😞', 'neutral': '😐'}
-                        st.metric("Sentiment", f"{emoji.get(sentiment, '😐')} {sentiment.title()}")
-                    
-                    if summary.get('keywords'):
-                        st.markdown("**Top Keywords:**")
-                        st.write(", ".join(summary['keywords'][:5]))
-                
-                # Action buttons
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    if st.button(f"📄 View Full", key=f"view_{i}"):
-                        st.json(summary)
-                
-                with col2:
-                    if st.button(f"💾 Download", key=f"download_{i}"):
-                        download_content = f"""
-Title: {summary['metadata'].get('title', 'N/A')}
-Generated: {summary['timestamp']}
-
-Summary:
-{summary['summary']}
-
-Keywords: {', '.join(summary.get('keywords', []))}
-"""
-                        st.download_button(
-                            label="📥 Download",
-                            data=download_content,
-                            file_name=f"summary_{summary['id']}.txt",
-                            mime="text/plain",
-                            key=f"dl_btn_{i}"
-                        )
-                
-                with col3:
-                    if st.button(f"🗑️ Delete", key=f"delete_{i}"):
-                        # Remove from session state
-                        original_index = len(st.session_state.summary_history) - 1 - i
-                        st.session_state.summary_history.pop(original_index)
-                        st.success("Summary deleted!")
-                        st.rerun()
-    else:
-        st.info("📭 No summaries yet. Go to 'Summarize Video' to create your first summary!")
-        
-        if st.button("🚀 Start Summarizing"):
-            st.session_state.page = "Summarize Video"
-            st.rerun()
+    history_list()
 
 elif page == "Settings":
     st.header("⚙️ Application Settings")
@@ -564,7 +783,7 @@ elif page == "Settings":
     
     - 🎥 **Multi-format Support**: YouTube URLs and uploaded video files
     - 🤖 **AI-Powered Summarization**: Using OpenAI GPT models via LangChain
-    - 📊 **Sentiment Analysis**: Emotional tone analysis using NLTK's VADER
+    - 📊 **Sentiment Analysis**: Emotional tone analysis using VADER
     - 🔍 **Keyword Extraction**: Automatic identification of key topics
     - 🌍 **Multi-language Support**: Summaries in multiple languages
     - 📱 **Responsive Design**: Works on desktop and mobile devices
@@ -574,8 +793,8 @@ elif page == "Settings":
     - Frontend: Streamlit
     - Backend: FastAPI
     - AI Models: OpenAI GPT via LangChain
-    - Video Processing: MoviePy, pytube
-    - Sentiment Analysis: NLTK
+    - Video Processing: ffmpeg, pytube
+    - Sentiment Analysis: VADER
     """)
 
 # Footer
@@ -12,8 +12,6 @@ def check_requirements():
     try:
         import streamlit
         import requests
-        import pandas
-        import matplotlib
         import plotly
         print("✅ All required packages are installed")
         return True
@@ -28,22 +26,30 @@ def check_backend_connection():
     
     print("🔍 Checking backend connection...")
     
-    for attempt in range(5):
+    # Reuse one keep-alive connection across attempts and back off exponentially,
+    # so a backend that is already up is detected on the first probe while a
+    # slow-starting one still gets about 13 seconds
+    session = requests.Session()
+    delays = (0.1, 0.2, 0.4, 0.8, 1.6, 3.2, 6.4)
+    attempts = len(delays) + 1
+    
+    for attempt in range(1, attempts + 1):
         try:
-            response = requests.get(f"{backend_url}/health", timeout=5)
-            if response.status_code == 200:
+            response = session.get(f"{backend_url}/health", timeout=5)
+            if response.ok:
                 print("✅ Backend is running and accessible")
                 return True
         except requests.exceptions.RequestException:
-            if attempt < 4:
-                print(f"⏳ Backend not ready, retrying in 2 seconds... (attempt {attempt + 1}/5)")
-                time.sleep(2)
-            else:
-                print("❌ Cannot connect to backend")
-                print("Please make sure the backend is running on port 8000")
-                print("Run: python run_backend.py (in another terminal)")
-                return False
+            pass
+        
+        if attempt < attempts:
+            delay = delays[attempt - 1]
+            print(f"⏳ Backend not ready, retrying in {delay:g} seconds... (attempt {attempt}/{attempts})")
+            time.sleep(delay)
     
+    print("❌ Cannot connect to backend")
+    print("Please make sure the backend is running on port 8000")
+    print("Run: python run_backend.py (in another terminal)")
     return False
 
 def main():
@@ -11,16 +11,16 @@ echo "🐍 Checking Python version..."
 python_version=$(python3 --version 2>&1 | grep -o '[0-9]\+\.[0-9]\+\.[0-9]\+' | head -n1)
 if [ -z "$python_version" ]; then
     echo "❌ Python 3 is not installed or not in PATH"
-    echo "Please install Python 3.8 or higher"
+    echo "Please install Python 3.9 or higher"
     exit 1
 fi
 
 major_version=$(echo $python_version | cut -d. -f1)
 minor_version=$(echo $python_version | cut -d. -f2)
 
-if [ "$major_version" -lt 3 ] || ([ "$major_version" -eq 3 ] && [ "$minor_version" -lt 8 ]); then
+if [ "$major_version" -lt 3 ] || ([ "$major_version" -eq 3 ] && [ "$minor_version" -lt 9 ]); then
     echo "❌ Python version $python_version is too old"
-    echo "Please install Python 3.8 or higher"
+    echo "Please install Python 3.9 or higher"
     exit 1
 fi
 
@@ -54,16 +54,6 @@ pip install -r requirements.txt
 echo "✅ All packages installed successfully"
 echo ""
 
-# Download NLTK data
-echo "🔤 Downloading NLTK data..."
-python -c "
-import nltk
-print('Downloading VADER lexicon...')
-nltk.download('vader_lexicon', quiet=True)
-print('✅ NLTK data downloaded')
-"
-echo ""
-
 # Create .env file if it doesn't exist
 if [ ! -f ".env" ]; then
     echo "⚙️ Creating .env file..."
@@ -93,8 +83,7 @@ try:
     import streamlit
     import openai
     import langchain
-    import nltk
-    import moviepy
+    import vaderSentiment
     import pytube
     print('✅ All critical packages imported successfully')
 except ImportError as e: